@@ -1,32 +1,123 @@
 from __future__ import annotations
 import json
+import math
+import os
+import sys
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
 import typer
 from hypotest.router import route_test, covariate_suggestion
 from hypotest.runner import run_bivariate
 from hypotest.narrator import summarize_result
 
+try:  # optional: pip install pyahocorasick
+    import ahocorasick
+except ImportError:  # pragma: no cover - fallback to plain substring scans
+    ahocorasick = None
+
+try:  # optional: pip install orjson
+    import orjson
+except ImportError:  # pragma: no cover - fallback to stdlib json
+    orjson = None  # type: ignore[assignment]
+
 app = typer.Typer(name="hypothesis", add_completion=False)
 
-def guess_relation(q: str) -> str:
-    ql = q.lower()
-    if any(k in ql for k in ["correlat", "association", "related"]):
-        return "association"
-    if any(k in ql for k in ["difference", "higher than", "lower than", "greater than", "less than", "compare", "diff"]):
-        return "group_mean_diff"
-    if any(k in ql for k in ["proportion", "rate", "odds", "likelihood"]):
-        return "proportion_diff"
+def _finite(obj: Any) -> Any:
+    # NaN/inf -> None, which is what orjson emits for them
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    return obj
+
+def _orjson_default(obj: Any) -> Any:
+    # float subclasses such as numpy.float64 are plain floats to json.dumps
+    if isinstance(obj, float):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(obj: Any) -> bytes:
+    # UTF-8 JSON bytes, indented by 2; both encoders accept the same inputs and
+    # write non-finite floats as null
+    if orjson is not None:
+        return orjson.dumps(obj, default=_orjson_default,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_finite(obj), indent=2, ensure_ascii=False).encode("utf-8")
+
+def _build_automaton(words: Dict[str, str]) -> Any:
+    # keyword -> payload; every (possibly overlapping) occurrence is reported in one pass
+    ac = ahocorasick.Automaton()
+    for word, value in words.items():
+        ac.add_word(word, value)
+    ac.make_automaton()
+    return ac
+
+# Relations in priority order with their keywords. Without the automaton these
+# plain substring scans are the fallback: for questions this short, a handful
+# of C-level `in` checks beats a regex that must try a match at every position.
+_REL_GROUPS = (
+    ("association", ("correlat", "association", "related")),
+    ("group_mean_diff", ("difference", "higher than", "lower than", "greater than",
+                         "less than", "compare", "diff")),
+    ("proportion_diff", ("proportion", "rate", "odds", "likelihood")),
+)
+_RELATIONS = tuple(rel for rel, _ in _REL_GROUPS)
+_REL_KEYWORDS = {k: rel for rel, kws in _REL_GROUPS for k in kws}  # keyword -> relation
+_REL_AC = _build_automaton(_REL_KEYWORDS) if ahocorasick is not None else None
+_REL_MIN_LEN = min(map(len, _REL_KEYWORDS))
+
+def _relation_of(ql: str) -> str:
+    # ql: the already-lowercased question
+    if len(ql) < _REL_MIN_LEN:
+        return "unknown"
+    if _REL_AC is None:
+        for rel, kws in _REL_GROUPS:
+            if any(k in ql for k in kws):
+                return rel
+        return "unknown"
+    hits = {rel for _, rel in _REL_AC.iter(ql)}
+    for rel in _RELATIONS:
+        if rel in hits:
+            return rel
     return "unknown"
 
-def extract_variables_simple(q: str):
-    ql = q.lower()
-    candidates = ["length_of_stay", "procedure_count", "total_charges",
-                  "admission_day", "discharge_disposition", "weight_class",
-                  "winner", "method", "rounds", "sig_str_red", "sig_str_blue"]
-    return [c for c in candidates if c.replace("_"," ") in ql or c in ql]
+@lru_cache(maxsize=1024)
+def guess_relation(q: str) -> str:
+    if len(q) < _REL_MIN_LEN:
+        return "unknown"
+    return _relation_of(q.lower())
+
+# Tuple, since the index, spellings and matchers below are all derived from it once at import
+CANDIDATES = ("length_of_stay", "procedure_count", "total_charges",
+              "admission_day", "discharge_disposition", "weight_class",
+              "winner", "method", "rounds", "sig_str_red", "sig_str_blue")
+_CAND_INDEX = {c: i for i, c in enumerate(CANDIDATES)}
+# spelling (underscored or spaced) -> canonical candidate name, computed once
+_CAND_FORMS = {**{c: c for c in CANDIDATES}, **{c.replace("_", " "): c for c in CANDIDATES}}
+_CAND_PAIRS = tuple((c, c.replace("_", " ")) for c in CANDIDATES)
+_VAR_AC = _build_automaton(_CAND_FORMS) if ahocorasick is not None else None
+_VAR_MIN_LEN = min(map(len, _CAND_FORMS))
+
+def _variables_of(ql: str) -> List[str]:
+    # ql: the already-lowercased question
+    if len(ql) < _VAR_MIN_LEN:
+        return []
+    if _VAR_AC is None:
+        return [c for c, spaced in _CAND_PAIRS if c in ql or spaced in ql]
+    found = {c for _, c in _VAR_AC.iter(ql)}
+    return sorted(found, key=_CAND_INDEX.__getitem__)
+
+def extract_variables_simple(q: str) -> List[str]:
+    if len(q) < _VAR_MIN_LEN:
+        return []
+    return _variables_of(q.lower())
 
-def build_hypotheses(relation: str, vars):
+def build_hypotheses(relation: str, vars: Sequence[str]) -> Dict[str, str]:
     if relation == "association" and len(vars) >= 2:
         x, y = vars[0], vars[1]
         return {
@@ -47,7 +138,7 @@ def build_hypotheses(relation: str, vars):
         }
     return {"H0":"Unable to form hypothesis", "H1":"Unable to form hypothesis"}
 
-def suggest_test(relation: str, vars):
+def suggest_test(relation: str, vars: Sequence[str]) -> str:
     if relation == "association":
         return "spearman_correlation"
     if relation == "group_mean_diff":
@@ -56,26 +147,99 @@ def suggest_test(relation: str, vars):
         return "chi_square"
     return "rule_based_unknown"
 
-def parse_question(question: str, schema: Optional[Dict[str, Any]] = None):
-    relation = guess_relation(question)
-    vars_found = extract_variables_simple(question)
+@dataclass(frozen=True, slots=True)
+class ParseResult:
+    """
+    Parsed question. Instances are cached and shared between callers, so they
+    are frozen; use dataclasses.replace to attach routing/execution output.
+    """
+    question: str
+    relation: str
+    variables: Tuple[str, ...]
+    hypotheses: Mapping[str, str]  # MappingProxyType when built by parse_question
+    suggested_test: str
+    alpha: float = 0.05
+    sided: str = "two-sided"
+    routed_test: Optional[Dict[str, Any]] = None
+    covariate_suggestion: Optional[Dict[str, Any]] = None
+    execution: Optional[Dict[str, Any]] = None
+    summary_text: Optional[str] = None
 
-    # If a schema is provided, keep only variables that exist in the schema
+    def to_dict(self) -> Dict[str, Any]:
+        # optional sections are left out until they have been filled in
+        out = {f.name: getattr(self, f.name) for f in fields(self)}
+        out["variables"] = list(self.variables)
+        out["hypotheses"] = dict(self.hypotheses)  # asdict can't copy a mappingproxy
+        return {k: v for k, v in out.items() if v is not None}
+
+def _schema_key(schema: Optional[Mapping[str, Any]]) -> Optional[FrozenSet[str]]:
     if schema and "columns" in schema:
-        cols = set(schema["columns"].keys())
+        return frozenset(schema["columns"].keys())
+    return None
+
+def parse_question(question: str, schema: Optional[Mapping[str, Any]] = None) -> ParseResult:
+    return _parse_question_cached(question, _schema_key(schema))
+
+def parse_questions(questions: Iterable[str], schema: Optional[Mapping[str, Any]] = None) -> List[ParseResult]:
+    """Batch form of parse_question; the schema key is built once for the whole batch."""
+    cols_key = _schema_key(schema)
+    parse = _parse_question_cached
+    return [parse(q, cols_key) for q in questions]
+
+@lru_cache(maxsize=1024)
+def _parse_question_cached(question: str, cols: Optional[FrozenSet[str]]) -> ParseResult:
+    ql = question.lower()  # lowercase once for both scans
+    relation = _relation_of(ql)
+    vars_found = _variables_of(ql)
+
+    # If a schema is provided, keep only variables that exist in the schema
+    if cols is not None:
         vars_found = [v for v in vars_found if v in cols]
 
     hyp = build_hypotheses(relation, vars_found)
     test = suggest_test(relation, vars_found)
-    return {
-        "question": question,
-        "relation": relation,
-        "variables": vars_found,
-        "hypotheses": hyp,
-        "suggested_test": test,
-        "alpha": 0.05,
-        "sided": "two-sided",
-    }
+    return ParseResult(
+        question=question,
+        relation=relation,
+        variables=tuple(vars_found),
+        # frozen only stops reassignment; the view keeps the cached dict from being edited
+        hypotheses=MappingProxyType(hyp),
+        suggested_test=test,
+    )
+
+_last_parent: Optional[str] = None
+
+def _write_output(out: str, data: bytes) -> None:
+    # Only create the output directory when it differs from the previous write
+    global _last_parent
+    parent = os.path.dirname(out)
+    if parent and parent != _last_parent:
+        os.makedirs(parent, exist_ok=True)
+        _last_parent = parent
+    try:
+        with open(out, "wb") as f:
+            f.write(data)
+    except FileNotFoundError:
+        if not parent:
+            raise
+        # directory was removed since we last created it
+        os.makedirs(parent, exist_ok=True)
+        with open(out, "wb") as f:
+            f.write(data)
+
+def _freeze(obj: Any) -> Any:
+    # read-only view of parsed JSON: dicts -> mappingproxy, lists -> tuples
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+@lru_cache(maxsize=16)
+def _load_schema(path: str, mtime_ns: int) -> Mapping[str, Any]:
+    # mtime in the key re-reads the file whenever it changes on disk; the parsed
+    # schema is shared between calls, so it is handed out read-only
+    return _freeze(json.loads(Path(path).read_text()))
 
 @app.command("parse")
 def cli_parse(
@@ -85,12 +249,16 @@ def cli_parse(
     data_path: str | None = typer.Option(None, "--data", help="Path to CSV to run the suggested test (optional)"),
 ):
     # 1) Load schema if provided
-    schema: Optional[Dict[str, Any]] = None
+    schema: Optional[Mapping[str, Any]] = None
     if schema_path:
         p = Path(schema_path)
-        if p.exists():
+        try:
+            mtime_ns: Optional[int] = p.stat().st_mtime_ns  # one stat doubles as the exists() check
+        except FileNotFoundError:
+            mtime_ns = None
+        if mtime_ns is not None:
             try:
-                schema = json.loads(p.read_text())
+                schema = _load_schema(str(p), mtime_ns)
             except Exception as e:
                 raise typer.BadParameter(f"Failed to read schema JSON at {schema_path}: {e}")
 
@@ -99,10 +267,10 @@ def cli_parse(
 
     # 2b) Routing + covariate suggestion
     schema_safe = schema or {"columns": {}, "rows": 0}
-    routed = route_test(result["relation"], result["variables"], schema_safe)
-    covar = covariate_suggestion(result["relation"], result["variables"], schema_safe)
-    result["routed_test"] = routed
-    result["covariate_suggestion"] = covar
+    variables = list(result.variables)
+    routed = route_test(result.relation, variables, schema_safe)
+    covar = covariate_suggestion(result.relation, variables, schema_safe)
+    result = replace(result, routed_test=routed, covariate_suggestion=covar)
 
     # 2c) Optional: execute the suggested test end-to-end on a CSV
     if data_path:
@@ -111,20 +279,21 @@ def cli_parse(
         p_data = Path(data_path)
         if not p_data.exists():
             raise typer.BadParameter(f"Data file not found: {data_path}")
-        import pandas as pd
-        df = pd.read_csv(p_data)
-        exec_res = run_bivariate(df, result["relation"], result["variables"], schema)
-        result["execution"] = exec_res
-        result["summary_text"] = summarize_result(exec_res)
+        # same reader as `infer`, so column types match the schema used for routing
+        from hypotest.io import load_data
+        df = load_data(p_data)
+        exec_res = run_bivariate(df, result.relation, variables, schema)
+        result = replace(result, execution=exec_res, summary_text=summarize_result(exec_res))
 
     # 3) Output
-    text = json.dumps(result, indent=2)
+    data = _dumps(result.to_dict())
     if out:
-        Path(out).parent.mkdir(parents=True, exist_ok=True)
-        Path(out).write_text(text)
+        _write_output(out, data)
         typer.echo(f"Wrote {out}")
     else:
-        typer.echo(text)
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.write(b"\n")  # separate write: no copy of the payload
+        sys.stdout.buffer.flush()
     
 
 if __name__ == "__main__":
@@ -17,43 +17,117 @@ def load_data(path: str | Path) -> pd.DataFrame:
     path = Path(path)
     if not path.exists():
         raise FileNotFoundError(f"Data file not found: {path}")
-    df = pd.read_csv(path)
+    try:
+        # multithreaded Arrow parser; Arrow-backed columns keep strings compact
+        df = _match_c_engine(pd.read_csv(path, engine="pyarrow", dtype_backend="pyarrow"))
+    except (ImportError, ValueError):
+        # no pyarrow, or a file the stricter Arrow parser rejects (e.g. ragged rows;
+        # ParserError is a ValueError) -> the lenient C engine
+        df = pd.read_csv(path)
     return df
 
 
-def infer_schema(df: pd.DataFrame) -> Dict[str, Any]:
+def _match_c_engine(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Align Arrow-inferred column types with what the default C engine yields, so the
+    schema doesn't depend on whether pyarrow is installed: dates/timestamps stay
+    text, ints with nulls and all-null columns become float, bools with nulls object.
+    """
+    import pyarrow as pa
+
+    casts: Dict[str, Any] = {}
+    for col, dtype in df.dtypes.items():
+        if not isinstance(dtype, pd.ArrowDtype):
+            continue
+        t = dtype.pyarrow_dtype
+        if pa.types.is_date(t) or pa.types.is_timestamp(t):
+            casts[col] = pd.ArrowDtype(pa.string())
+        elif pa.types.is_null(t):
+            casts[col] = pd.ArrowDtype(pa.float64())
+        elif pa.types.is_integer(t) and df[col].hasnans:
+            casts[col] = pd.ArrowDtype(pa.float64())
+        elif pa.types.is_boolean(t) and df[col].hasnans:
+            casts[col] = object
+    return df.astype(casts) if casts else df
+
+
+def _simplify_dtype(dtype) -> str:
+    """
+    Map a pandas dtype to a simplified dtype name. Object/string dtypes map to
+    'text' and are resolved to 'category' or 'string' by cardinality.
+    """
+    if isinstance(dtype, pd.ArrowDtype):
+        return _simplify_arrow_type(dtype.pyarrow_dtype)
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "int"
+    if pd.api.types.is_float_dtype(dtype):
+        return "float"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "text" if _simplify_dtype(dtype.categories.dtype) == "text" else "string"
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        return "text"
+    return "string"
+
+
+def _simplify_arrow_type(pa_type) -> str:
+    import pyarrow as pa
+
+    if pa.types.is_dictionary(pa_type):
+        return _simplify_arrow_type(pa_type.value_type)
+    if pa.types.is_boolean(pa_type):
+        return "bool"
+    if pa.types.is_integer(pa_type):
+        return "int"
+    if pa.types.is_floating(pa_type) or pa.types.is_decimal(pa_type):
+        return "float"
+    if pa.types.is_timestamp(pa_type) or pa.types.is_date(pa_type):
+        return "datetime"
+    if pa.types.is_string(pa_type) or pa.types.is_large_string(pa_type):
+        return "text"
+    return "string"
+
+
+def infer_schema(df: pd.DataFrame, sample_rows: int | None = None) -> Dict[str, Any]:
     """
     Infer a simple schema: column -> {dtype, non_null, unique_frac}
     Dtypes are simplified to: 'int', 'float', 'bool', 'category', 'datetime', 'string'
+    Cardinality (unique_frac, category heuristic) is estimated from the first
+    `sample_rows` rows, by default min(len(df), 100_000).
     """
     schema: Dict[str, Any] = {"columns": {}}
 
-    def simplify_dtype(s: pd.Series) -> str:
-        if pd.api.types.is_bool_dtype(s):
-            return "bool"
-        if pd.api.types.is_integer_dtype(s):
-            return "int"
-        if pd.api.types.is_float_dtype(s):
-            return "float"
-        if pd.api.types.is_datetime64_any_dtype(s):
-            return "datetime"
-        # heuristic: low-cardinality strings => category candidate
-        if pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
-            unique = s.dropna().nunique()
-            if unique <= max(20, int(len(s) * 0.05)):
-                return "category"
-            return "string"
-        return "string"
-
-    for col in df.columns:
-        s = df[col]
-        dtype = simplify_dtype(s)
-        non_null = int(s.notna().sum())
-        unique_frac = float(s.nunique(dropna=True) / max(len(s), 1))
+    if sample_rows is None:
+        sample_rows = min(len(df), 100_000)
+    elif sample_rows < 1:
+        raise ValueError(f"sample_rows must be >= 1, got {sample_rows}")
+    sample = df if sample_rows >= len(df) else df.head(sample_rows)
+    n_sample = len(sample)
+
+    # Frame-level reductions: one vectorized pass each instead of per column
+    kinds = df.dtypes.map(_simplify_dtype)
+    non_null = df.count()  # counts non-nulls without materializing a boolean frame
+    nunique = sample.nunique(dropna=True)
+
+    low_card = max(20, int(n_sample * 0.05))
+    for col, kind, nn, unique in zip(df.columns, kinds, non_null, nunique):
+        dtype = kind
+        if kind == "text":
+            # heuristic: low-cardinality strings => category candidate
+            dtype = "category" if unique <= low_card else "string"
+        # Low-cardinality columns (repeats seen, few distinct values) have met
+        # (nearly) all their groups in the sample, so divide by the full row count:
+        # unique_frac * rows then still estimates the group count the router works
+        # from. Other columns grow with the data; the sample fraction fits them.
+        saturated = unique <= low_card and unique < n_sample
+        denom = len(df) if saturated else n_sample
         schema["columns"][col] = {
             "dtype": dtype,
-            "non_null": non_null,
-            "unique_frac": round(unique_frac, 4),
+            "non_null": int(nn),
+            "unique_frac": round(float(unique / max(denom, 1)), 4),
         }
 
     schema["rows"] = int(len(df))
@@ -72,11 +146,14 @@ def validate_against_schema(df: pd.DataFrame, schema: Dict[str, Any]) -> Dict[st
     Very lightweight validator: check columns present and non-null > 0 for each schema column.
     """
     issues = []
-    for col, meta in schema.get("columns", {}).items():
-        if col not in df.columns:
+    sch_cols = list(schema.get("columns", {}))
+    present = [c for c in sch_cols if c in df.columns]
+    # any() stops at the first non-null per column instead of counting them all
+    any_nonnull = df[present].notna().any(axis=0)
+    for col in sch_cols:
+        if col not in any_nonnull.index:
             issues.append({"column": col, "issue": "missing_column"})
-            continue
-        if df[col].notna().sum() == 0:
+        elif not any_nonnull[col]:
             issues.append({"column": col, "issue": "all_null_values"})
     return {"ok": len(issues) == 0, "issues": issues}
 
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-import subprocess, shutil
+from urllib.parse import urlsplit
+import http.client, json, subprocess, shutil
 
 @dataclass
 class LLMConfig:
@@ -7,24 +8,92 @@ class LLMConfig:
     model: str = "mistral"
     max_tokens: int = 400
     temperature: float = 0.2
+    ollama_url: str = "http://localhost:11434"
+    timeout: float = 120.0  # seconds per HTTP request to the Ollama server
 
 class LLMClient:
     def __init__(self, cfg: LLMConfig):
         self.cfg = cfg
+        self._conn: http.client.HTTPConnection | None = None  # keep-alive to the Ollama server
+        self._url = urlsplit(cfg.ollama_url)
+        if cfg.llm_provider == "ollama" and self._url.scheme not in ("http", "https"):
+            raise ValueError(f"ollama_url must be http:// or https://, got {cfg.ollama_url!r}")
+        self._endpoint = self._url.path.rstrip("/") + "/api/generate"
+        self._prefix = ""
+        self._prefix_bytes = b""
+        # resolved once; the absolute path also spares execvp a PATH search per call
+        self._ollama_path = shutil.which("ollama") if cfg.llm_provider == "ollama" else None
 
     @classmethod
     def from_config(cls, cfg_dict: dict) -> "LLMClient":
         return cls(LLMConfig(**{**LLMConfig().__dict__, **cfg_dict}))
 
+    def set_prefix(self, text: str) -> None:
+        """Fixed text (e.g. a few-shot template) prepended to every prompt; encoded once here."""
+        self._prefix = text
+        self._prefix_bytes = text.encode("utf-8")
+
+    def _new_conn(self) -> http.client.HTTPConnection:
+        # port=None lets http.client pick the scheme's default (80/443)
+        conn_cls = http.client.HTTPSConnection if self._url.scheme == "https" else http.client.HTTPConnection
+        return conn_cls(self._url.hostname or "localhost", self._url.port, timeout=self.cfg.timeout)
+
+    def _ollama_http(self, prompt: str) -> str:
+        body = json.dumps({
+            "model": self.cfg.model,
+            "prompt": self._prefix + prompt,
+            "stream": False,
+            "options": {"num_predict": self.cfg.max_tokens, "temperature": self.cfg.temperature},
+        })
+        # Retry once on a fresh connection: the server may have dropped an idle keep-alive
+        for attempt in range(2):
+            if self._conn is None:
+                self._conn = self._new_conn()
+            try:
+                self._conn.request("POST", self._endpoint, body=body,
+                                   headers={"Content-Type": "application/json"})
+                res = self._conn.getresponse()
+                data = res.read()
+                break
+            except (OSError, http.client.HTTPException) as exc:
+                self._conn.close()
+                self._conn = None
+                # a stalled server won't do better on a second try
+                if attempt or isinstance(exc, TimeoutError):
+                    raise
+        if res.status != 200:
+            raise RuntimeError(data.decode() or f"Ollama returned HTTP {res.status}")
+        try:
+            return json.loads(data)["response"]
+        except (ValueError, KeyError, TypeError) as exc:
+            raise RuntimeError(f"Unexpected Ollama response: {data[:200]!r}") from exc
+
+    def _ollama_cli(self, prompt: str) -> str:
+        if self._ollama_path is None:
+            raise RuntimeError("Ollama not found. Install with: brew install ollama")
+        cmd = [self._ollama_path, "run", self.cfg.model]
+        res = subprocess.run(cmd, input=self._prefix_bytes + prompt.encode("utf-8"), capture_output=True)
+        if res.returncode != 0:
+            raise RuntimeError(res.stderr.decode() or "Ollama failed")
+        return res.stdout.decode()
+
     def generate(self, prompt: str) -> str:
         if self.cfg.llm_provider == "ollama":
-            if shutil.which("ollama") is None:
-                raise RuntimeError("Ollama not found. Install with: brew install ollama")
-            cmd = ["ollama", "run", self.cfg.model]
-            res = subprocess.run(cmd, input=prompt.encode(), capture_output=True)
-            if res.returncode != 0:
-                raise RuntimeError(res.stderr.decode() or "Ollama failed")
-            return res.stdout.decode()
+            try:
+                return self._ollama_http(prompt)
+            except TimeoutError as exc:
+                raise RuntimeError(
+                    f"Ollama server at {self.cfg.ollama_url} timed out after {self.cfg.timeout}s"
+                ) from exc
+            except (OSError, http.client.HTTPException) as exc:
+                # server not reachable (e.g. `ollama serve` not running): one-shot CLI
+                try:
+                    return self._ollama_cli(prompt)
+                except RuntimeError as cli_exc:
+                    raise RuntimeError(
+                        f"Ollama server at {self.cfg.ollama_url} unreachable ({exc}); "
+                        f"CLI fallback failed: {cli_exc}"
+                    ) from exc
         elif self.cfg.llm_provider == "rule_based":
             return "RULE_BASED_RESPONSE"
         else:
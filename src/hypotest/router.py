@@ -1,37 +1,37 @@
 from __future__ import annotations
-from typing import Dict, Any, List, Tuple
+from functools import lru_cache
+from typing import Dict, Any, List, Mapping, NamedTuple, Tuple
 
-NUM_DTYPES = {"int", "float"}
-CAT_DTYPES = {"bool", "category", "string"}
-DATETIME_DTYPES = {"datetime"}
+NUM_DTYPES = frozenset({"int", "float"})
+CAT_DTYPES = frozenset({"bool", "category", "string"})
+DATETIME_DTYPES = frozenset({"datetime"})
 
 # Helper Functions
 
-def _col_meta(schema: Dict[str, Any], col: str) -> Dict[str, Any]:
+def _col_meta(schema: Mapping[str, Any], col: str) -> Mapping[str, Any]:
     return schema.get("columns", {}).get(col, {})
 
-def _dtype(schema: Dict[str, Any], col: str) -> str: 
-    return _col_meta(schema, col).get("dtype", "unknown")
+class ColKind(NamedTuple):
+    is_num: bool
+    is_cat: bool
+    is_dt: bool
+    dtype: str
+    unique_frac: Any  # raw schema value; only coerced to float where it is used
 
-def _unique_frac(schema: Dict[str, Any], col: str) -> float:
-    return float(_col_meta(schema, col).get("unique_frac", 1.0))
-
-def _is_numeric(schema: Dict[str, Any], col: str) -> bool:
-    return _dtype(schema, col) in NUM_DTYPES
-
-def _is_datetime(schema: Dict[str, Any], col: str) -> bool:
-    return _dtype(schema, col) in DATETIME_DTYPES
-
-def _is_categorical(schema: Dict[str, Any], col: str) -> bool:
-    dt = _dtype(schema, col)
-    if dt in CAT_DTYPES:
-        return True
+@lru_cache(maxsize=2048)
+def _col_kind(dtype: str, unique_frac: Any) -> ColKind:
+    # keyed on the column metadata values, so edits to a schema are never stale
     # heuristic: treat low-cardinality strings as categorical even if typed string
-    return dt == "string" and _unique_frac(schema, col) < 0.05
+    is_cat = dtype in CAT_DTYPES or (dtype == "string" and float(unique_frac) < 0.05)
+    return ColKind(dtype in NUM_DTYPES, is_cat, dtype in DATETIME_DTYPES, dtype, unique_frac)
+
+def _classify(schema: Mapping[str, Any], col: str) -> ColKind:
+    meta = _col_meta(schema, col)
+    return _col_kind(meta.get("dtype", "unknown"), meta.get("unique_frac", 1.0))
 
-def _group_count_hint(schema: Dict[str, Any], col: str, n_rows: int) -> int:
+def _group_count_hint(unique_frac: Any, n_rows: int) -> int:
     # crude estimate: unique_frac * N
-    uf = _unique_frac(schema, col)
+    uf = float(unique_frac)
     return max(1, int(round(uf * max(n_rows, 1))))
 
 # Core Routing
@@ -39,7 +39,7 @@ def _group_count_hint(schema: Dict[str, Any], col: str, n_rows: int) -> int:
 def route_test(
     relation: str,
     variables: List[str],
-    schema: Dict[str, Any],
+    schema: Mapping[str, Any],
 ) -> Dict[str, Any]:
     """
     Decide an appropriate statistical test from relation + variable types.
@@ -58,17 +58,16 @@ def route_test(
 
 
     # Map types
-    x_num = _is_numeric(schema, x)
-    y_num = _is_numeric(schema, y)
-    x_cat = _is_categorical(schema, x)
-    y_cat = _is_categorical(schema, y)
+    xk, yk = _classify(schema, x), _classify(schema, y)
+    x_num, y_num = xk.is_num, yk.is_num
+    x_cat, y_cat = xk.is_cat, yk.is_cat
     
     # Datetime is unsupported directly here
-    if _is_datetime(schema, x) or _is_datetime(schema, y):
+    if xk.is_dt or yk.is_dt:
         return {
             "suggested_test": "unsupported_datetime",
             "reason": "Datetime detected; convert to derived numeric/categorical first",
-            "notes": {"x_dtype": _dtype(schema, x), "y_dtype": _dtype(schema, y)},
+            "notes": {"x_dtype": xk.dtype, "y_dtype": yk.dtype},
         }
     
     # --- Relation-specific routing ---
@@ -78,12 +77,12 @@ def route_test(
             return {
                 "suggested_test": "spearman_correlation",
                 "reason": "Both numeric; monotonic association requested",
-                "notes": {"x_dtype": _dtype(schema, x), "y_dtype": _dtype(schema, y)},
+                "notes": {"x_dtype": xk.dtype, "y_dtype": yk.dtype},
             }
         # categorical-numeric → group comparison on numeric by groups
         if (x_cat and y_num) or (x_num and y_cat):
-            grp, metric = (x, y) if x_cat and y_num else (y, x)
-            k = _group_count_hint(schema, grp, n_rows)
+            grp, metric, grp_kind = (x, y, xk) if x_cat and y_num else (y, x, yk)
+            k = _group_count_hint(grp_kind.unique_frac, n_rows)
             test = "kruskal_wallis" if k > 2 else "mann_whitney_or_welch_t"
             return {
                 "suggested_test": test,
@@ -100,13 +99,13 @@ def route_test(
         return {
             "suggested_test": "unknown_association",
             "reason": "Unrecognized type combo for association",
-            "notes": {"x": _dtype(schema, x), "y": _dtype(schema, y)},
+            "notes": {"x": xk.dtype, "y": yk.dtype},
         }
 
     if relation == "group_mean_diff":
         # Expect first var = group, second = numeric metric (but be flexible)
         if x_cat and y_num:
-            k = _group_count_hint(schema, x, n_rows)
+            k = _group_count_hint(xk.unique_frac, n_rows)
             test = "anova" if k > 2 else "welch_t_or_mann_whitney"
             return {
                 "suggested_test": test,
@@ -114,7 +113,7 @@ def route_test(
                 "notes": {"groups_est": k},
             }
         if y_cat and x_num:
-            k = _group_count_hint(schema, y, n_rows)
+            k = _group_count_hint(yk.unique_frac, n_rows)
             test = "anova" if k > 2 else "welch_t_or_mann_whitney"
             return {
                 "suggested_test": test,
@@ -124,7 +123,7 @@ def route_test(
         return {
             "suggested_test": "unknown_group_mean_diff",
             "reason": "Need one categorical (group) and one numeric (metric)",
-            "notes": {"x": _dtype(schema, x), "y": _dtype(schema, y)},
+            "notes": {"x": xk.dtype, "y": yk.dtype},
         }
 
     if relation == "proportion_diff":
@@ -138,7 +137,7 @@ def route_test(
         return {
             "suggested_test": "unknown_proportion_diff",
             "reason": "Proportion difference expects categorical variables",
-            "notes": {"x": _dtype(schema, x), "y": _dtype(schema, y)},
+            "notes": {"x": xk.dtype, "y": yk.dtype},
         }
 
     # Fallback
@@ -151,7 +150,7 @@ def route_test(
 # --- Covariate suggestions -------------------------------------------------
 
 def covariate_suggestion(
-    relation: str, variables: List[str], schema: Dict[str, Any]
+    relation: str, variables: List[str], schema: Mapping[str, Any]
 ) -> Dict[str, Any]:
     """
     Suggest when a regression (OLS/logistic) is more appropriate
@@ -161,8 +160,9 @@ def covariate_suggestion(
         return {"suggestion": "none", "reason": "Need ≥2 variables"}
 
     x, y = variables[0], variables[1]
-    x_num, y_num = _is_numeric(schema, x), _is_numeric(schema, y)
-    x_cat, y_cat = _is_categorical(schema, x), _is_categorical(schema, y)
+    xk, yk = _classify(schema, x), _classify(schema, y)
+    x_num, y_num = xk.is_num, yk.is_num
+    x_cat, y_cat = xk.is_cat, yk.is_cat
 
     # If both numeric and you're considering association → OLS with covariates is a natural extension.
     if relation == "association" and x_num and y_num:
@@ -171,7 +171,7 @@ def covariate_suggestion(
     # If outcome looks categorical and predictor numeric/cat → logistic.
     # Heuristic: treat 'winner'/'expired' keywords as categorical outcomes.
     outcome = y  # assume second variable often plays 'outcome' role
-    if relation in {"group_mean_diff", "proportion_diff"} and _is_categorical(schema, outcome):
+    if relation in {"group_mean_diff", "proportion_diff"} and yk.is_cat:
         return {"suggestion": "logistic", "reason": f"Categorical outcome ({outcome}); consider logit with covariates"}
 
     return {"suggestion": "none", "reason": "Bivariate test likely sufficient for MVP"}
\ No newline at end of file
@@ -1,9 +1,92 @@
-from hypotest.hypotheses import parse_question
+import dataclasses
+import json
+import pytest
+from hypotest import hypotheses
+from hypotest.hypotheses import parse_question, parse_questions
 
 def test_parse_simple():
     q = "Does length_of_stay correlate with procedure_count?"
     res = parse_question(q)
-    assert res["relation"] == "association"
-    assert "length_of_stay" in res["variables"]
-    assert "procedure_count" in res["variables"]
-    assert res["suggested_test"] == "spearman_correlation"
+    assert res.relation == "association"
+    assert "length_of_stay" in res.variables
+    assert "procedure_count" in res.variables
+    assert res.suggested_test == "spearman_correlation"
+
+def test_parse_repeat_result_is_read_only():
+    q = "Does length_of_stay correlate with procedure_count?"
+    first = parse_question(q)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.relation = "unknown"
+    with pytest.raises(TypeError):
+        first.hypotheses["H0"] = "poisoned"
+    second = parse_question(q)
+    assert second.variables == ("length_of_stay", "procedure_count")
+    assert second.hypotheses["H0"].startswith("There is no monotonic association")
+    assert "routed_test" not in second.to_dict()
+
+def test_parse_questions_batch_matches_single():
+    schema = {"columns": {"winner": {}, "weight_class": {}}}
+    qs = ["Is the rate of winner different by weight_class?", "Does rounds correlate with method?"]
+    assert parse_questions(qs, schema) == [parse_question(q, schema) for q in qs]
+    assert parse_questions(qs, schema)[1].variables == ()
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_backend(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(hypotheses, "orjson", None)
+    return request.param
+
+def test_dumps_backends_agree(json_backend):
+    np = pytest.importorskip("numpy")
+    payload = {"p_value": float("nan"), "stat": np.float64(2.5), "effect": [float("inf"), 1], "txt": "ρ"}
+    out = hypotheses._dumps(payload)
+    assert json.loads(out) == {"p_value": None, "stat": 2.5, "effect": [None, 1], "txt": "ρ"}
+    with pytest.raises(TypeError):
+        hypotheses._dumps({"arr": np.array([1.0])})
+
+def test_load_schema_is_cached_and_read_only(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps({"columns": {"winner": {"dtype": "category"}}, "rows": 3}))
+    mtime = path.stat().st_mtime_ns
+    first = hypotheses._load_schema(str(path), mtime)
+    with pytest.raises(TypeError):
+        first["columns"]["winner"]["dtype"] = "int"
+    assert hypotheses._load_schema(str(path), mtime) is first
+    assert parse_question("winner by weight_class", first).variables == ("winner",)
+
+@pytest.fixture(params=["automaton", "substring"])
+def keyword_backend(request, monkeypatch):
+    if request.param == "automaton":
+        if hypotheses._REL_AC is None:
+            pytest.skip("pyahocorasick not installed")
+    else:
+        monkeypatch.setattr(hypotheses, "_REL_AC", None)
+        monkeypatch.setattr(hypotheses, "_VAR_AC", None)
+    hypotheses.guess_relation.cache_clear()
+    yield request.param
+    hypotheses.guess_relation.cache_clear()
+
+@pytest.mark.parametrize("q, relation", [
+    ("Is rounds correlated with method?", "association"),  # correlat + related overlap
+    ("Are separate cohorts alike?", "proportion_diff"),  # "rate" inside "separate"
+    ("Is there a difference in rounds?", "group_mean_diff"),  # difference vs diff
+    ("diff", "group_mean_diff"),
+    ("Does the rate differ by weight class?", "group_mean_diff"),  # diff beats rate
+    ("ODDS of winning", "proportion_diff"),
+    ("What is the weather?", "unknown"),
+    ("abc", "unknown"),
+])
+def test_guess_relation_backends(keyword_backend, q, relation):
+    assert hypotheses.guess_relation(q) == relation
+
+@pytest.mark.parametrize("q, variables", [
+    ("length of stay vs procedure_count", ["length_of_stay", "procedure_count"]),
+    ("SIG STR RED and sig_str_blue", ["sig_str_red", "sig_str_blue"]),
+    ("winner by weight class", ["weight_class", "winner"]),
+    ("Rounds", ["rounds"]),
+    ("", []),
+])
+def test_extract_variables_backends(keyword_backend, q, variables):
+    assert hypotheses.extract_variables_simple(q) == variables
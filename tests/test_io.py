@@ -1,5 +1,6 @@
+import pytest
 import pandas as pd
-from hypotest.io import load_data, infer_schema
+from hypotest.io import load_data, infer_schema, validate_against_schema
 
 def test_infer_schema_runs(tmp_path):
     csv = tmp_path / "demo.csv"
@@ -7,3 +8,54 @@ def test_infer_schema_runs(tmp_path):
     df = load_data(csv)
     schema = infer_schema(df)
     assert "columns" in schema and "a" in schema["columns"]
+
+def test_infer_schema_sample_rows():
+    df = pd.DataFrame({"a": list(range(10)), "b": ["x"] * 5 + [None] * 5})
+    schema = infer_schema(df, sample_rows=5)
+    assert schema["rows"] == 10
+    assert schema["columns"]["b"]["non_null"] == 5
+    assert schema["columns"]["a"]["unique_frac"] == 1.0
+
+def test_load_data_engines_agree_on_schema(tmp_path):
+    pytest.importorskip("pyarrow")
+    csv = tmp_path / "demo.csv"
+    csv.write_text(
+        "n,b,d,ts,s,empty\n"
+        "1,True,2024-01-01,2024-01-01 10:00:00,x,\n"
+        ",,2024-01-02,2024-01-02 11:00:00,y,\n"
+        "3,False,2024-01-03,2024-01-03 12:00:00,,\n"
+    )
+    arrow = infer_schema(load_data(csv))
+    assert arrow == infer_schema(pd.read_csv(csv))
+    assert arrow["columns"]["n"]["dtype"] == "float" and arrow["columns"]["n"]["non_null"] == 2
+
+def test_validate_against_schema_flags_issues():
+    df = pd.DataFrame({"a": [1, 2], "b": [None, None]})
+    schema = {"columns": {"a": {}, "b": {}, "c": {}}}
+    res = validate_against_schema(df, schema)
+    assert not res["ok"]
+    assert res["issues"] == [
+        {"column": "b", "issue": "all_null_values"},
+        {"column": "c", "issue": "missing_column"},
+    ]
+    assert validate_against_schema(df[["a"]], {"columns": {"a": {}}})["ok"]
+
+@pytest.mark.parametrize("sample_rows", [0, -3])
+def test_infer_schema_rejects_bad_sample_rows(sample_rows):
+    with pytest.raises(ValueError):
+        infer_schema(pd.DataFrame({"a": [1, 2, 3]}), sample_rows=sample_rows)
+
+def test_load_data_short_row_falls_back(tmp_path):
+    csv = tmp_path / "ragged.csv"
+    csv.write_text("a,b\n1,2\n3\n")
+    df = load_data(csv)
+    assert len(df) == 2 and df["b"].isna().sum() == 1
+
+def test_infer_schema_sampled_group_count():
+    rows = 4000
+    df = pd.DataFrame({"grp": [f"g{i % 30}" for i in range(rows)], "id": range(rows)})
+    schema = infer_schema(df, sample_rows=1000)
+    grp = schema["columns"]["grp"]
+    assert grp["dtype"] == "category"
+    assert round(grp["unique_frac"] * schema["rows"]) == 30
+    assert schema["columns"]["id"]["unique_frac"] == 1.0
@@ -0,0 +1,109 @@
+import http.client
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from hypotest.llm import LLMClient, LLMConfig
+
+
+class _OllamaStub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real server
+    delay = 0.0
+    body = None  # raw reply override
+
+    def do_POST(self):
+        req = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(req)
+        self.server.paths.append(self.path)
+        if self.delay:
+            threading.Event().wait(self.delay)
+        out = self.body if self.body is not None else json.dumps({"response": f"echo:{req['prompt']}"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = HTTPServer(("127.0.0.1", 0), _OllamaStub)
+    server.requests = []
+    server.paths = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _dead_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def test_generate_over_http(stub):
+    client = LLMClient.from_config({"ollama_url": f"http://127.0.0.1:{stub.server_port}", "max_tokens": 7})
+    client.set_prefix("SYS ")
+    assert client.generate("a") == "echo:SYS a"
+    assert client.generate("b") == "echo:SYS b"
+    req = stub.requests[-1]
+    assert req["stream"] is False and req["options"]["num_predict"] == 7
+
+
+def test_generate_retries_on_dropped_connection(stub):
+    client = LLMClient(LLMConfig(ollama_url=f"http://127.0.0.1:{stub.server_port}"))
+    # stale keep-alive pointing at a closed port
+    dead_port = int(_dead_url().rsplit(":", 1)[1])
+    client._conn = http.client.HTTPConnection("127.0.0.1", dead_port)
+    assert client.generate("x") == "echo:x"
+
+
+def test_unreachable_server_reports_connection_error(monkeypatch):
+    client = LLMClient(LLMConfig(ollama_url=_dead_url()))
+    monkeypatch.setattr(client, "_ollama_path", None)
+    with pytest.raises(RuntimeError, match="unreachable") as info:
+        client.generate("x")
+    assert isinstance(info.value.__cause__, OSError)
+
+
+def test_generate_times_out(stub, monkeypatch):
+    monkeypatch.setattr(_OllamaStub, "delay", 1.0)
+    client = LLMClient(LLMConfig(ollama_url=f"http://127.0.0.1:{stub.server_port}", timeout=0.2))
+    with pytest.raises(RuntimeError, match="timed out") as info:
+        client.generate("x")
+    assert isinstance(info.value.__cause__, TimeoutError)
+
+
+def test_ollama_url_path_prefix(stub):
+    client = LLMClient(LLMConfig(ollama_url=f"http://127.0.0.1:{stub.server_port}/ollama/"))
+    assert client.generate("x") == "echo:x"
+    assert stub.paths == ["/ollama/api/generate"]
+
+
+@pytest.mark.parametrize("url, conn_cls, port", [
+    ("http://example.com", http.client.HTTPConnection, 80),
+    ("https://example.com", http.client.HTTPSConnection, 443),
+    ("https://example.com:8443", http.client.HTTPSConnection, 8443),
+])
+def test_ollama_url_scheme_and_default_port(url, conn_cls, port):
+    conn = LLMClient(LLMConfig(ollama_url=url))._new_conn()
+    assert type(conn) is conn_cls and conn.port == port
+
+
+def test_ollama_url_rejects_other_schemes():
+    with pytest.raises(ValueError):
+        LLMClient(LLMConfig(ollama_url="ftp://example.com"))
+
+
+@pytest.mark.parametrize("body", [b"not json", b'{"done": true}'])
+def test_malformed_response_raises_runtime_error(stub, monkeypatch, body):
+    monkeypatch.setattr(_OllamaStub, "body", body)
+    client = LLMClient(LLMConfig(ollama_url=f"http://127.0.0.1:{stub.server_port}"))
+    with pytest.raises(RuntimeError, match="Unexpected Ollama response"):
+        client.generate("x")
@@ -63,4 +63,15 @@ def test_association_cat_num_routes_group_test():
 
 def test_association_num_cat_routes_group_test():
     res = route_test("association", ["total_charges", "weight_class"], SCHEMA)
-    assert res["suggested_test"] in {"mann_whitney_or_welch_t", "kruskal_wallis"}
\ No newline at end of file
+    assert res["suggested_test"] in {"mann_whitney_or_welch_t", "kruskal_wallis"}
+
+def test_null_unique_frac_on_numeric_columns():
+    schema = {
+        "rows": 10,
+        "columns": {
+            "a": {"dtype": "int", "unique_frac": None},
+            "b": {"dtype": "float", "unique_frac": None},
+        },
+    }
+    assert route_test("association", ["a", "b"], schema)["suggested_test"] == "spearman_correlation"
+    assert covariate_suggestion("association", ["a", "b"], schema)["suggestion"] == "ols"